@@ -1,4 +1,5 @@
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
 using System.Linq;
 using System.Threading.Tasks;
@@ -34,6 +35,19 @@ namespace FTMSBluetoothForwarder
         private static readonly Guid EchelonServiceUuid = Guid.Parse("0bf669f1-45f2-11e7-9598-0800200c9a66");
         private static readonly Guid EchelonCharacteristicUuid = Guid.Parse("0bf669f4-45f2-11e7-9598-0800200c9a66");
 
+        private static readonly Dictionary<Guid, string> CharacteristicNames = new()
+        {
+            [FtmsIndoorBikeDataUuid] = "FTMS Indoor Bike",
+            [CyclingPowerMeasurementUuid] = "Cycling Power",
+            [HeartRateMeasurementUuid] = "Heart Rate",
+            [KeiserCharacteristicUuid] = "Keiser M3i",
+            [EchelonCharacteristicUuid] = "Echelon",
+        };
+
+        // UUID strings sent upstream with every notification, formatted once per characteristic.
+        // ValueChanged fires on WinRT threads, hence the concurrent map.
+        private readonly ConcurrentDictionary<Guid, string> _uuidStrings = new();
+
         public event Action<string, byte[]>? OnRawDataReceived;  // characteristicUuid, bytes
         public event Action<string>? OnDisconnected;
         public event Action<string>? OnLog;
@@ -190,7 +204,8 @@ namespace FTMSBluetoothForwarder
                 var bytes = new byte[args.CharacteristicValue.Length];
                 reader.ReadBytes(bytes);
 
-                OnRawDataReceived?.Invoke(sender.Uuid.ToString(), bytes);
+                var uuid = _uuidStrings.GetOrAdd(sender.Uuid, static u => u.ToString());
+                OnRawDataReceived?.Invoke(uuid, bytes);
             }
             catch (Exception ex)
             {
@@ -244,12 +259,7 @@ namespace FTMSBluetoothForwarder
 
         private string GetCharacteristicName(Guid uuid)
         {
-            if (uuid == FtmsIndoorBikeDataUuid) return "FTMS Indoor Bike";
-            if (uuid == CyclingPowerMeasurementUuid) return "Cycling Power";
-            if (uuid == HeartRateMeasurementUuid) return "Heart Rate";
-            if (uuid == KeiserCharacteristicUuid) return "Keiser M3i";
-            if (uuid == EchelonCharacteristicUuid) return "Echelon";
-            return uuid.ToString();
+            return CharacteristicNames.TryGetValue(uuid, out var name) ? name : uuid.ToString();
         }
 
         private void OnConnectionStatusChanged(BluetoothLEDevice sender, object args)
@@ -1,4 +1,5 @@
 using System;
+using System.Buffers.Binary;
 
 namespace FTMSBluetoothForwarder
 {
@@ -7,8 +8,21 @@ namespace FTMSBluetoothForwarder
     /// </summary>
     public static class FtmsDataBuilder
     {
+        // Debug flag - set to true to log packet bytes
+        public static bool DebugLogging = false;
+        public static Action<string>? OnDebugLog;
+
+        /// <summary>
+        /// Frame size: Flags (2) + Speed (2) + Cadence (2) + Power (2) + Heart Rate (1).
+        /// </summary>
+        public const int IndoorBikeDataLength = 9;
+
+        // Every frame carries the same fields: Bit 2 cadence, Bit 6 power, Bit 9 heart rate
+        private const ushort IndoorBikeDataFlags = (1 << 2) | (1 << 6) | (1 << 9);
+
         /// <summary>
-        /// Build Indoor Bike Data characteristic value.
+        /// Write Indoor Bike Data characteristic value into a caller-owned buffer of at least
+        /// <see cref="IndoorBikeDataLength"/> bytes, so the notify loop can reuse one array.
         ///
         /// Flags (16-bit):
         /// - Bit 0: More Data (0 = all data present in this message)
@@ -25,50 +39,31 @@ namespace FTMSBluetoothForwarder
         /// - Bit 11: Elapsed Time Present (0 = not present)
         /// - Bit 12: Remaining Time Present (0 = not present)
         /// </summary>
-        // Debug flag - set to true to log packet bytes
-        public static bool DebugLogging = false;
-        public static Action<string>? OnDebugLog;
-
-        public static byte[] BuildIndoorBikeData(FitnessData data)
+        public static void WriteIndoorBikeData(FitnessData data, Span<byte> span)
         {
-            ushort flags = 0;
-            using var ms = new MemoryStream();
-            using var writer = new BinaryWriter(ms);
-
-            // Reserve space for flags (will write at end)
-            writer.Write((ushort)0);
+            BinaryPrimitives.WriteUInt16LittleEndian(span, IndoorBikeDataFlags);
 
             // Always include instantaneous speed (when bit 0 of flags is 0)
             // Speed in 0.01 km/h resolution - set to 0 since apps calculate their own
-            writer.Write((ushort)0);
+            BinaryPrimitives.WriteUInt16LittleEndian(span.Slice(2), 0);
 
             // Bit 2: Instantaneous Cadence (0.5 rpm resolution)
-            flags |= (1 << 2);
             ushort cadence = (ushort)(data.Cadence * 2); // 0.5 rpm resolution
-            writer.Write(cadence);
+            BinaryPrimitives.WriteUInt16LittleEndian(span.Slice(4), cadence);
 
             // Bit 6: Instantaneous Power (watts, signed 16-bit)
-            flags |= (1 << 6);
-            writer.Write((short)data.Power);
+            BinaryPrimitives.WriteInt16LittleEndian(span.Slice(6), (short)data.Power);
 
             // Bit 9: Heart Rate (bpm, uint8)
-            flags |= (1 << 9);
-            writer.Write((byte)data.HeartRate);
-
-            // Go back and write flags at the beginning
-            var result = ms.ToArray();
-            result[0] = (byte)(flags & 0xFF);
-            result[1] = (byte)((flags >> 8) & 0xFF);
+            span[8] = (byte)data.HeartRate;
 
             // Debug: log the packet bytes
             if (DebugLogging && OnDebugLog != null)
             {
-                var hex = BitConverter.ToString(result);
-                OnDebugLog($"FTMS Packet ({result.Length} bytes): {hex}");
-                OnDebugLog($"  Flags: 0x{flags:X4}, HR at byte 8: {result[8]}");
+                var hex = BitConverter.ToString(span.Slice(0, IndoorBikeDataLength).ToArray());
+                OnDebugLog($"FTMS Packet ({IndoorBikeDataLength} bytes): {hex}");
+                OnDebugLog($"  Flags: 0x{IndoorBikeDataFlags:X4}, HR at byte 8: {span[8]}");
             }
-
-            return result;
         }
 
         /// <summary>
@@ -1,4 +1,6 @@
 using System;
+using System.Diagnostics;
+using System.Runtime.InteropServices.WindowsRuntime;
 using System.Threading.Tasks;
 using Windows.Devices.Bluetooth;
 using Windows.Devices.Bluetooth.Advertisement;
@@ -47,13 +49,52 @@ namespace FTMSBluetoothForwarder
         private GattLocalCharacteristic? _statusChar;
         private GattLocalCharacteristic? _heartRateMeasurementChar;
 
+        // Replaced wholesale by UpdateData (stdin thread) and read by NotifyAsync (notify loop);
+        // a reference swap is atomic, so no lock is needed
         private FitnessData _currentData = new();
         private bool _controlGranted;
-        private readonly object _dataLock = new();
 
-        public event Action<string>? OnLog;
+        // Notification payloads are packed into these arrays every tick. Each is wrapped
+        // once as an IBuffer that shares its memory, so the notify path allocates nothing.
+        private readonly byte[] _bikeDataBuffer = new byte[FtmsDataBuilder.IndoorBikeDataLength];
+        private readonly IBuffer _bikeDataNotifyBuffer;
+
+        // Heart Rate Measurement: Byte 0 = flags (0x00 = HR is uint8), Byte 1 = HR value
+        private readonly byte[] _heartRateBuffer = new byte[2];
+        private readonly IBuffer _heartRateNotifyBuffer;
+
+        // Set by UpdateData when broadcast values change, consumed by NotifyAsync.
+        // Unchanged data is only re-sent at the keepalive interval (~1 Hz);
+        // a zero timestamp forces the next send. The timestamps belong to the notify loop.
+        private static readonly TimeSpan NotifyKeepaliveInterval = TimeSpan.FromSeconds(1);
+        private int _dataChanged = 1;
+        private long _lastBikeDataSentTimestamp;
+        private long _lastHeartRateSentTimestamp;
+
+        // Subscriber counts cached from SubscribedClientsChanged, so a tick never has to
+        // fetch each characteristic's SubscribedClients vector.
+        // The handlers run on WinRT threadpool threads; they only publish the count and
+        // raise a resend flag, which the notify loop consumes like _dataChanged.
+        private int _bikeDataSubscriberCount;
+        private int _heartRateSubscriberCount;
+        private int _bikeDataResendPending;
+        private int _heartRateResendPending;
+
+        // Notify loop runs only while the server is started (4Hz as per FTMS spec)
+        private static readonly TimeSpan NotifyInterval = TimeSpan.FromMilliseconds(250);
+        private CancellationTokenSource? _notifyCts;
+        private Task _notifyLoopTask = Task.CompletedTask;
+
+        // (message, level) — level is "info" or "error", as in the bridge's log events
+        public event Action<string, string>? OnLog;
         public event Action<string, object?>? OnStatus;
 
+        public FtmsGattServer()
+        {
+            _bikeDataNotifyBuffer = CreateBuffer(_bikeDataBuffer);
+            _heartRateNotifyBuffer = CreateBuffer(_heartRateBuffer);
+        }
+
         public bool IsRunning => _serviceProvider?.AdvertisementStatus == GattServiceProviderAdvertisementStatus.Started;
 
         public string DeviceName { get; set; } = "TD Bike";
@@ -65,17 +106,22 @@ namespace FTMSBluetoothForwarder
         {
             Log($"[FTMS Status] IsRunning: {IsRunning}");
             Log($"[FTMS Status] ServiceProvider: {_serviceProvider?.AdvertisementStatus}");
-            Log($"[FTMS Status] IndoorBikeData subscribers: {_indoorBikeDataChar?.SubscribedClients.Count ?? 0}");
-            Log($"[FTMS Status] HeartRate subscribers: {_heartRateMeasurementChar?.SubscribedClients.Count ?? 0}");
+            Log($"[FTMS Status] IndoorBikeData subscribers: {Volatile.Read(ref _bikeDataSubscriberCount)}");
+            Log($"[FTMS Status] HeartRate subscribers: {Volatile.Read(ref _heartRateSubscriberCount)}");
             Log($"[FTMS Status] Advertiser: {_advertiser?.Status}");
         }
 
+        /// <summary>
+        /// Publish new data for the next notification. The instance must not be modified afterwards.
+        /// </summary>
         public void UpdateData(FitnessData data)
         {
-            lock (_dataLock)
-            {
-                _currentData = data;
-            }
+            var current = Volatile.Read(ref _currentData);
+            if (data.Power == current.Power && data.Cadence == current.Cadence && data.HeartRate == current.HeartRate)
+                return;
+
+            Volatile.Write(ref _currentData, data);
+            Volatile.Write(ref _dataChanged, 1);
         }
 
         public async Task<bool> StartAsync()
@@ -86,13 +132,13 @@ namespace FTMSBluetoothForwarder
                 var adapter = await BluetoothAdapter.GetDefaultAsync();
                 if (adapter == null)
                 {
-                    Log("No Bluetooth adapter found");
+                    Log("No Bluetooth adapter found", "error");
                     return false;
                 }
 
                 if (!adapter.IsPeripheralRoleSupported)
                 {
-                    Log("Bluetooth adapter does not support peripheral role");
+                    Log("Bluetooth adapter does not support peripheral role", "error");
                     return false;
                 }
 
@@ -102,7 +148,7 @@ namespace FTMSBluetoothForwarder
                 var serviceResult = await GattServiceProvider.CreateAsync(FtmsServiceUuid);
                 if (serviceResult.Error != BluetoothError.Success)
                 {
-                    Log($"Failed to create service: {serviceResult.Error}");
+                    Log($"Failed to create service: {serviceResult.Error}", "error");
                     return false;
                 }
 
@@ -137,17 +183,32 @@ namespace FTMSBluetoothForwarder
                 Log($"Service: {FtmsServiceUuid}");
                 Log($"Characteristics: Feature={FitnessMachineFeatureUuid}, BikeData={IndoorBikeDataUuid}, ControlPoint={ControlPointUuid}, Status={FtmsStatusUuid}");
 
+                await StartNotifyLoopAsync();
+
                 return true;
             }
             catch (Exception ex)
             {
-                Log($"Error starting server: {ex.Message}");
+                Log($"Error starting server: {ex.Message}", "error");
                 return false;
             }
         }
 
         public void Stop()
         {
+            StopNotifyLoop();
+
+            // Detach subscriber handlers so the old characteristics can't overwrite the
+            // cached counts once StartAsync has created new ones
+            if (_indoorBikeDataChar != null)
+                _indoorBikeDataChar.SubscribedClientsChanged -= OnIndoorBikeDataSubscribersChanged;
+            if (_heartRateMeasurementChar != null)
+                _heartRateMeasurementChar.SubscribedClientsChanged -= OnHeartRateSubscribersChanged;
+            Volatile.Write(ref _bikeDataSubscriberCount, 0);
+            Volatile.Write(ref _heartRateSubscriberCount, 0);
+            Volatile.Write(ref _bikeDataResendPending, 0);
+            Volatile.Write(ref _heartRateResendPending, 0);
+
             // Stop explicit advertiser
             if (_advertiser != null)
             {
@@ -158,7 +219,7 @@ namespace FTMSBluetoothForwarder
                 }
                 catch (Exception ex)
                 {
-                    Log($"Error stopping advertiser: {ex.Message}");
+                    Log($"Error stopping advertiser: {ex.Message}", "error");
                 }
             }
 
@@ -173,7 +234,7 @@ namespace FTMSBluetoothForwarder
                 }
                 catch (Exception ex)
                 {
-                    Log($"Error stopping FTMS service: {ex.Message}");
+                    Log($"Error stopping FTMS service: {ex.Message}", "error");
                 }
             }
 
@@ -187,7 +248,7 @@ namespace FTMSBluetoothForwarder
                 }
                 catch (Exception ex)
                 {
-                    Log($"Error stopping Heart Rate service: {ex.Message}");
+                    Log($"Error stopping Heart Rate service: {ex.Message}", "error");
                 }
             }
 
@@ -277,69 +338,139 @@ namespace FTMSBluetoothForwarder
             }
         }
 
-        public async Task NotifyAsync()
+        private async Task StartNotifyLoopAsync()
+        {
+            StopNotifyLoop();
+
+            // A cancelled loop may still be inside NotifyAsync; let it finish before the new
+            // loop starts rewriting the shared notify buffers and sent timestamps
+            await _notifyLoopTask;
+
+            _notifyCts = new CancellationTokenSource();
+            var token = _notifyCts.Token;
+            _notifyLoopTask = Task.Run(() => RunNotifyLoopAsync(token));
+        }
+
+        private void StopNotifyLoop()
+        {
+            _notifyCts?.Cancel();
+            _notifyCts?.Dispose();
+            _notifyCts = null;
+        }
+
+        /// <summary>
+        /// PeriodicTimer ticks on a fixed schedule no matter how long NotifyAsync takes,
+        /// and reuses one timer instead of allocating a new delay every iteration.
+        /// </summary>
+        private async Task RunNotifyLoopAsync(CancellationToken token)
         {
+            using var timer = new PeriodicTimer(NotifyInterval);
+            int tickCount = 0;
             try
             {
-                FitnessData data;
-                lock (_dataLock)
+                while (await timer.WaitForNextTickAsync(token))
                 {
-                    data = _currentData;
-                }
-
-                // Notify FTMS Indoor Bike Data
-                if (_indoorBikeDataChar != null && _indoorBikeDataChar.SubscribedClients.Count > 0)
-                {
-                    var bikeData = FtmsDataBuilder.BuildIndoorBikeData(data);
-                    var writer = new DataWriter();
-                    writer.WriteBytes(bikeData);
-
-                    foreach (var client in _indoorBikeDataChar.SubscribedClients)
+                    try
                     {
-                        await _indoorBikeDataChar.NotifyValueAsync(writer.DetachBuffer(), client);
+                        await NotifyAsync();
+
+                        // Log status every 10 seconds (40 ticks at 4Hz)
+                        tickCount++;
+                        if (tickCount >= 40)
+                        {
+                            tickCount = 0;
+                            LogConnectionStatus();
+                        }
                     }
-                }
-
-                // Notify Heart Rate Measurement (separate service)
-                if (_heartRateMeasurementChar != null && _heartRateMeasurementChar.SubscribedClients.Count > 0 && data.HeartRate > 0)
-                {
-                    // Heart Rate Measurement format:
-                    // Byte 0: Flags (0x00 = HR is uint8, no other fields)
-                    // Byte 1: Heart Rate value (uint8)
-                    var hrData = new byte[] { 0x00, (byte)data.HeartRate };
-                    var hrWriter = new DataWriter();
-                    hrWriter.WriteBytes(hrData);
-
-                    foreach (var client in _heartRateMeasurementChar.SubscribedClients)
+                    catch (Exception ex)
                     {
-                        await _heartRateMeasurementChar.NotifyValueAsync(hrWriter.DetachBuffer(), client);
+                        Log($"Notify loop error: {ex.Message}", "error");
                     }
                 }
             }
-            catch (Exception ex)
+            catch (OperationCanceledException)
             {
-                Log($"Notify error: {ex.Message}");
+                // Server stopped
+            }
+        }
+
+        /// <summary>
+        /// Push the current data to subscribed clients. Errors propagate to the notify loop,
+        /// which logs them and keeps ticking.
+        /// </summary>
+        private async Task NotifyAsync()
+        {
+            bool changed = Interlocked.Exchange(ref _dataChanged, 0) == 1;
+            var data = Volatile.Read(ref _currentData);
+
+            // A subscription change forces the next send (see the SubscribedClientsChanged handlers)
+            if (Interlocked.Exchange(ref _bikeDataResendPending, 0) == 1)
+                _lastBikeDataSentTimestamp = 0;
+            if (Interlocked.Exchange(ref _heartRateResendPending, 0) == 1)
+                _lastHeartRateSentTimestamp = 0;
+
+            // Characteristics are WinRT projections — resolve each once per tick
+            // instead of once per use
+            var bikeDataChar = _indoorBikeDataChar;
+            var heartRateChar = _heartRateMeasurementChar;
+
+            // Notify FTMS Indoor Bike Data
+            if (bikeDataChar != null && Volatile.Read(ref _bikeDataSubscriberCount) > 0 &&
+                (changed || IsKeepaliveDue(_lastBikeDataSentTimestamp)))
+            {
+                FtmsDataBuilder.WriteIndoorBikeData(data, _bikeDataBuffer);
+
+                // One call notifies every subscriber. Still awaited: the buffer is reused next tick.
+                // Per-client failures come back in the results rather than as exceptions.
+                var results = await bikeDataChar.NotifyValueAsync(_bikeDataNotifyBuffer);
+                LogNotifyFailures("Indoor Bike Data", results);
+
+                _lastBikeDataSentTimestamp = Stopwatch.GetTimestamp();
+            }
+
+            // Notify Heart Rate Measurement (separate service)
+            if (heartRateChar != null && Volatile.Read(ref _heartRateSubscriberCount) > 0 && data.HeartRate > 0 &&
+                (changed || IsKeepaliveDue(_lastHeartRateSentTimestamp)))
+            {
+                _heartRateBuffer[1] = (byte)data.HeartRate;
+
+                var results = await heartRateChar.NotifyValueAsync(_heartRateNotifyBuffer);
+                LogNotifyFailures("Heart Rate", results);
+
+                _lastHeartRateSentTimestamp = Stopwatch.GetTimestamp();
+            }
+        }
+
+        private static bool IsKeepaliveDue(long lastSentTimestamp)
+        {
+            return lastSentTimestamp == 0 || Stopwatch.GetElapsedTime(lastSentTimestamp) >= NotifyKeepaliveInterval;
+        }
+
+        private void LogNotifyFailures(string characteristic, IReadOnlyList<GattClientNotificationResult> results)
+        {
+            foreach (var result in results)
+            {
+                if (result.Status != GattCommunicationStatus.Success)
+                    Log($"[FTMS] {characteristic} notify failed: {result.Status}, ProtocolError: {result.ProtocolError}", "error");
             }
         }
 
         private async Task CreateFitnessMachineFeatureCharacteristic()
         {
             var featureData = FtmsDataBuilder.BuildFitnessMachineFeature();
-            var writer = new DataWriter();
-            writer.WriteBytes(featureData);
 
             var parameters = new GattLocalCharacteristicParameters
             {
                 CharacteristicProperties = GattCharacteristicProperties.Read,
                 ReadProtectionLevel = GattProtectionLevel.Plain,
-                StaticValue = writer.DetachBuffer()
+                StaticValue = CreateBuffer(featureData)
             };
 
             var result = await _serviceProvider!.Service.CreateCharacteristicAsync(
                 FitnessMachineFeatureUuid, parameters);
 
             if (result.Error != BluetoothError.Success)
-                Log($"Failed to create Feature characteristic: {result.Error}");
+                Log($"Failed to create Feature characteristic: {result.Error}", "error");
         }
 
         private async Task CreateIndoorBikeDataCharacteristic()
@@ -356,52 +487,49 @@ namespace FTMSBluetoothForwarder
             if (result.Error == BluetoothError.Success)
             {
                 _indoorBikeDataChar = result.Characteristic;
+                _bikeDataSubscriberCount = 0;
                 _indoorBikeDataChar.SubscribedClientsChanged += OnIndoorBikeDataSubscribersChanged;
             }
             else
             {
-                Log($"Failed to create IndoorBikeData characteristic: {result.Error}");
+                Log($"Failed to create IndoorBikeData characteristic: {result.Error}", "error");
             }
         }
 
         private async Task CreateSupportedPowerRangeCharacteristic()
         {
             var rangeData = FtmsDataBuilder.BuildSupportedPowerRange();
-            var writer = new DataWriter();
-            writer.WriteBytes(rangeData);
 
             var parameters = new GattLocalCharacteristicParameters
             {
                 CharacteristicProperties = GattCharacteristicProperties.Read,
                 ReadProtectionLevel = GattProtectionLevel.Plain,
-                StaticValue = writer.DetachBuffer()
+                StaticValue = CreateBuffer(rangeData)
             };
 
             var result = await _serviceProvider!.Service.CreateCharacteristicAsync(
                 SupportedPowerRangeUuid, parameters);
 
             if (result.Error != BluetoothError.Success)
-                Log($"Failed to create SupportedPowerRange characteristic: {result.Error}");
+                Log($"Failed to create SupportedPowerRange characteristic: {result.Error}", "error");
         }
 
         private async Task CreateSupportedResistanceRangeCharacteristic()
         {
             var rangeData = FtmsDataBuilder.BuildSupportedResistanceRange();
-            var writer = new DataWriter();
-            writer.WriteBytes(rangeData);
 
             var parameters = new GattLocalCharacteristicParameters
             {
                 CharacteristicProperties = GattCharacteristicProperties.Read,
                 ReadProtectionLevel = GattProtectionLevel.Plain,
-                StaticValue = writer.DetachBuffer()
+                StaticValue = CreateBuffer(rangeData)
             };
 
             var result = await _serviceProvider!.Service.CreateCharacteristicAsync(
                 SupportedResistanceRangeUuid, parameters);
 
             if (result.Error != BluetoothError.Success)
-                Log($"Failed to create SupportedResistanceRange characteristic: {result.Error}");
+                Log($"Failed to create SupportedResistanceRange characteristic: {result.Error}", "error");
         }
 
         private async Task CreateControlPointCharacteristic()
@@ -423,7 +551,7 @@ namespace FTMSBluetoothForwarder
             }
             else
             {
-                Log($"Failed to create ControlPoint characteristic: {result.Error}");
+                Log($"Failed to create ControlPoint characteristic: {result.Error}", "error");
             }
         }
 
@@ -444,7 +572,7 @@ namespace FTMSBluetoothForwarder
             }
             else
             {
-                Log($"Failed to create Status characteristic: {result.Error}");
+                Log($"Failed to create Status characteristic: {result.Error}", "error");
             }
         }
 
@@ -456,7 +584,7 @@ namespace FTMSBluetoothForwarder
                 var serviceResult = await GattServiceProvider.CreateAsync(HeartRateServiceUuid);
                 if (serviceResult.Error != BluetoothError.Success)
                 {
-                    Log($"Failed to create Heart Rate service: {serviceResult.Error}");
+                    Log($"Failed to create Heart Rate service: {serviceResult.Error}", "error");
                     return;
                 }
 
@@ -475,12 +603,13 @@ namespace FTMSBluetoothForwarder
                 if (result.Error == BluetoothError.Success)
                 {
                     _heartRateMeasurementChar = result.Characteristic;
+                    _heartRateSubscriberCount = 0;
                     _heartRateMeasurementChar.SubscribedClientsChanged += OnHeartRateSubscribersChanged;
                     Log("Heart Rate Service created successfully");
                 }
                 else
                 {
-                    Log($"Failed to create Heart Rate Measurement characteristic: {result.Error}");
+                    Log($"Failed to create Heart Rate Measurement characteristic: {result.Error}", "error");
                     return;
                 }
 
@@ -494,15 +623,22 @@ namespace FTMSBluetoothForwarder
             }
             catch (Exception ex)
             {
-                Log($"Error creating Heart Rate service: {ex.Message}");
+                Log($"Error creating Heart Rate service: {ex.Message}", "error");
             }
         }
 
         private void OnHeartRateSubscribersChanged(GattLocalCharacteristic sender, object args)
         {
+            // Ignore late events from a characteristic replaced by a restart
+            if (!ReferenceEquals(sender, _heartRateMeasurementChar)) return;
+
             int count = sender.SubscribedClients.Count;
+            Volatile.Write(ref _heartRateSubscriberCount, count);
             Log($"[FTMS] Heart Rate subscribers changed: {count}");
 
+            // Make sure a newly subscribed client gets a value on the next tick
+            Volatile.Write(ref _heartRateResendPending, 1);
+
             // Log each subscribed client
             foreach (var client in sender.SubscribedClients)
             {
@@ -516,9 +652,16 @@ namespace FTMSBluetoothForwarder
 
         private void OnIndoorBikeDataSubscribersChanged(GattLocalCharacteristic sender, object args)
         {
+            // Ignore late events from a characteristic replaced by a restart
+            if (!ReferenceEquals(sender, _indoorBikeDataChar)) return;
+
             int count = sender.SubscribedClients.Count;
+            Volatile.Write(ref _bikeDataSubscriberCount, count);
             Log($"[FTMS] Indoor Bike Data subscribers changed: {count}");
 
+            // Make sure a newly subscribed client gets a frame on the next tick
+            Volatile.Write(ref _bikeDataResendPending, 1);
+
             // Log each subscribed client
             foreach (var client in sender.SubscribedClients)
             {
@@ -572,7 +715,7 @@ namespace FTMSBluetoothForwarder
             }
             catch (Exception ex)
             {
-                Log($"Control point error: {ex.Message}");
+                Log($"Control point error: {ex.Message}", "error");
             }
             finally
             {
@@ -631,9 +774,7 @@ namespace FTMSBluetoothForwarder
             try
             {
                 var response = FtmsDataBuilder.BuildControlPointResponse(requestOpCode, result);
-                var writer = new DataWriter();
-                writer.WriteBytes(response);
-                var buffer = writer.DetachBuffer();
+                var buffer = CreateBuffer(response);
 
                 foreach (var client in _controlPointChar.SubscribedClients)
                 {
@@ -644,7 +785,7 @@ namespace FTMSBluetoothForwarder
             }
             catch (Exception ex)
             {
-                Log($"Failed to send control response: {ex.Message}");
+                Log($"Failed to send control response: {ex.Message}", "error");
             }
         }
 
@@ -670,9 +811,18 @@ namespace FTMSBluetoothForwarder
             }
         }
 
-        private void Log(string message)
+        /// <summary>
+        /// Wrap bytes as a WinRT IBuffer in one call. The buffer shares the array rather than
+        /// copying it through a DataWriter, and can be notified to any number of clients.
+        /// </summary>
+        private static IBuffer CreateBuffer(byte[] data)
+        {
+            return data.AsBuffer();
+        }
+
+        private void Log(string message, string level = "info")
         {
-            OnLog?.Invoke(message);
+            OnLog?.Invoke(message, level);
         }
 
         private void SendStatus(string status, object? extra = null)
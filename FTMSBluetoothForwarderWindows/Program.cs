@@ -1,4 +1,5 @@
 using System;
+using System.Buffers;
 using System.Linq;
 using System.Text.Json;
 using System.Text.Json.Serialization;
@@ -45,6 +46,14 @@ string? autoReconnectDeviceName = null;
 // Track if FTMS broadcasting has started (lazy start on first data/connection)
 bool ftmsStarted = false;
 
+// The in-flight StartAsync, shared by every caller that asks for a start while it runs
+// (stdin commands, legacy data, raw device notifications); guarded by ftmsStartLock
+Task<bool>? ftmsStartTask = null;
+var ftmsStartLock = new object();
+
+// Legacy data lines from one stdin read are coalesced; only the newest reaches the server
+FitnessData? pendingData = null;
+
 // JSON serialization options
 var jsonOptions = new JsonSerializerOptions
 {
@@ -53,40 +62,104 @@ var jsonOptions = new JsonSerializerOptions
     DefaultIgnoreCondition = JsonIgnoreCondition.WhenWritingNull
 };
 
+// FTMS_LOG=0 suppresses info log lines (no serialization, no write).
+// Error-level lines from Log() and the FTMS server, status, data and error events are always sent.
+bool logEnabled = Environment.GetEnvironmentVariable("FTMS_LOG") != "0";
+
+// Events are serialized straight to UTF-8 and written to the raw stdout stream in a
+// single write, bypassing Console.Out's text encoder and per-line flush.
+// Callers run on several threads (stdin, notify loop, WinRT callbacks), hence the lock.
+var stdout = Console.OpenStandardOutput();
+var stdoutBuffer = new ArrayBufferWriter<byte>(256);
+var stdoutJsonWriter = new Utf8JsonWriter(stdoutBuffer);
+var stdoutLock = new object();
+
+// Write one JSON value produced by `write`, newline-terminated, as a single stdout write
+void WriteLine(Action<Utf8JsonWriter> write)
+{
+    lock (stdoutLock)
+    {
+        stdoutBuffer.Clear();
+        stdoutJsonWriter.Reset(stdoutBuffer);
+        write(stdoutJsonWriter);
+        stdoutJsonWriter.Flush();
+
+        stdoutBuffer.GetSpan(1)[0] = (byte)'\n';
+        stdoutBuffer.Advance(1);
+        stdout.Write(stdoutBuffer.WrittenSpan);
+    }
+}
+
+void WriteJsonLine(object payload)
+{
+    WriteLine(writer => JsonSerializer.Serialize(writer, payload, jsonOptions));
+}
+
+// Legacy status line: the extra object's properties followed by "status", written in one
+// pass instead of round-tripping the extra object through a dictionary.
+void WriteStatusLine(string status, object extra)
+{
+    WriteLine(writer =>
+    {
+        writer.WriteStartObject();
+        foreach (var property in JsonSerializer.SerializeToElement(extra, jsonOptions).EnumerateObject())
+            property.WriteTo(writer);
+        writer.WriteString("status", status);
+        writer.WriteEndObject();
+    });
+}
+
 // Send JSON event to stdout
 void SendEvent(object eventObj)
 {
-    var json = JsonSerializer.Serialize(eventObj, jsonOptions);
-    Console.WriteLine(json);
+    WriteJsonLine(eventObj);
 }
 
 void Log(string message, string level = "info")
 {
+    if (!logEnabled && level != "error") return;
     SendEvent(new { type = "log", level, message });
 }
 
+// Start FTMS broadcasting unless it is already running; concurrent callers share one start
+Task<bool> EnsureFtmsStartedAsync(string reason)
+{
+    lock (ftmsStartLock)
+    {
+        if (ftmsStarted) return Task.FromResult(true);
+        if (ftmsStartTask == null)
+        {
+            Log($"Starting FTMS broadcast ({reason})...");
+            // Task.Run so the start never completes inline while the lock is held
+            ftmsStartTask = Task.Run(async () =>
+            {
+                bool started = await server.StartAsync();
+                lock (ftmsStartLock)
+                {
+                    ftmsStarted = started;
+                    ftmsStartTask = null;
+                }
+                return started;
+            });
+        }
+        return ftmsStartTask;
+    }
+}
+
 // Hook up FTMS server events
-server.OnLog += message =>
+server.OnLog += (message, level) =>
 {
+    if (!logEnabled && level != "error") return;
     // Send in both old format (for backward compat) and new format
-    Console.WriteLine(JsonSerializer.Serialize(new { log = message }, jsonOptions));
+    WriteJsonLine(new { log = message });
 };
 server.OnStatus += (status, extra) =>
 {
     // Send in old format for backward compatibility
-    object outputObj;
     if (extra != null)
-    {
-        var extraJson = JsonSerializer.Serialize(extra, jsonOptions);
-        var extraDict = JsonSerializer.Deserialize<Dictionary<string, object>>(extraJson);
-        extraDict!["status"] = status;
-        outputObj = extraDict;
-    }
+        WriteStatusLine(status, extra);
     else
-    {
-        outputObj = new { status };
-    }
-    Console.WriteLine(JsonSerializer.Serialize(outputObj, jsonOptions));
+        WriteJsonLine(new { status });
 };
 
 // Hook up scanner events
@@ -115,14 +188,11 @@ scanner.OnScanComplete += count =>
 connection.OnLog += message => Log(message);
 connection.OnRawDataReceived += (characteristicUuid, bytes) =>
 {
-    // Start FTMS server on first raw data if not already started
-    if (!ftmsStarted)
+    // Start FTMS server on first raw data if not already started.
+    // Notifications keep arriving while StartAsync runs; they all join the same start.
+    if (!Volatile.Read(ref ftmsStarted))
     {
-        _ = Task.Run(async () =>
-        {
-            Log("Starting FTMS broadcast (data from .NET connection)...");
-            ftmsStarted = await server.StartAsync();
-        });
+        _ = EnsureFtmsStartedAsync("data from .NET connection");
     }
 
     // Send raw bytes to Electron (int[] avoids base64 serialization)
@@ -167,7 +237,7 @@ connection.OnDisconnected += reason =>
 };
 
 // Handle commands from stdin
-async Task HandleCommand(string line)
+async Task HandleCommand(ReadOnlyMemory<byte> line)
 {
     try
     {
@@ -205,16 +275,14 @@ async Task HandleCommand(string line)
             if (hasData)
             {
                 // Start FTMS server on first data received (lazy start)
-                if (!ftmsStarted)
+                if (!Volatile.Read(ref ftmsStarted))
                 {
-                    Log("Starting FTMS broadcast (data received)...");
-                    ftmsStarted = await server.StartAsync();
-                    if (!ftmsStarted)
+                    if (!await EnsureFtmsStartedAsync("data received"))
                     {
                         Log("Failed to start FTMS server", "error");
                     }
                 }
-                server.UpdateData(legacyData);
+                pendingData = legacyData;
             }
             return;
         }
@@ -225,11 +293,9 @@ async Task HandleCommand(string line)
         {
             case "startBroadcast":
                 // Explicitly start FTMS broadcasting
-                if (!ftmsStarted)
+                if (!Volatile.Read(ref ftmsStarted))
                 {
-                    Log("Starting FTMS broadcast (explicit command)...");
-                    ftmsStarted = await server.StartAsync();
-                    if (ftmsStarted)
+                    if (await EnsureFtmsStartedAsync("explicit command"))
                     {
                         Log("FTMS broadcast started successfully");
                     }
@@ -245,12 +311,19 @@ async Task HandleCommand(string line)
                 break;
 
             case "stopBroadcast":
-                // Stop FTMS broadcasting
-                if (ftmsStarted)
+                // Stop FTMS broadcasting; a start still in flight finishes first
+                Task<bool>? startInFlight;
+                lock (ftmsStartLock)
+                    startInFlight = ftmsStartTask;
+                if (startInFlight != null)
+                    await startInFlight;
+
+                if (Volatile.Read(ref ftmsStarted))
                 {
                     Log("Stopping FTMS broadcast...");
                     server.Stop();
-                    ftmsStarted = false;
+                    lock (ftmsStartLock)
+                        ftmsStarted = false;
                 }
                 break;
 
@@ -290,10 +363,9 @@ async Task HandleCommand(string line)
                             });
 
                             // Start FTMS broadcasting if not already running
-                            if (!ftmsStarted)
+                            if (!Volatile.Read(ref ftmsStarted))
                             {
-                                Log("Starting FTMS broadcast (device connected)...");
-                                ftmsStarted = await server.StartAsync();
+                                await EnsureFtmsStartedAsync("device connected");
                             }
                         }
                         else
@@ -398,53 +470,47 @@ SendEvent(new
     platform = "windows"
 });
 
-// Start FTMS notification loop (4Hz as per FTMS spec)
-var notifyTask = Task.Run(async () =>
+// Read stdin for commands
+// Lines are split out of raw UTF-8 bytes and parsed in place, so no string is
+// decoded and allocated per line. The buffer grows only if a single line outgrows it.
+var stdinTask = Task.Run(async () =>
 {
-    int tickCount = 0;
-    while (!cts.Token.IsCancellationRequested)
+    try
     {
-        try
+        var stdin = Console.OpenStandardInput();
+        var buffer = new byte[16 * 1024];
+        int filled = 0;
+
+        while (!cts.Token.IsCancellationRequested)
         {
-            if (server.IsRunning)
+            if (filled == buffer.Length)
+                Array.Resize(ref buffer, buffer.Length * 2);
+
+            int read = await stdin.ReadAsync(buffer.AsMemory(filled));
+            if (read == 0)
             {
-                await server.NotifyAsync();
+                // EOF: handle a final line that had no trailing newline
+                if (filled > 0) await HandleLine(buffer.AsMemory(0, filled));
+                FlushPendingData();
+                break;
             }
+            filled += read;
 
-            // Log status every 10 seconds (40 ticks at 4Hz)
-            tickCount++;
-            if (tickCount >= 40)
+            int start = 0;
+            int newline;
+            while ((newline = Array.IndexOf(buffer, (byte)'\n', start, filled - start)) >= 0)
             {
-                tickCount = 0;
-                if (ftmsStarted)
-                {
-                    server.LogConnectionStatus();
-                }
+                await HandleLine(buffer.AsMemory(start, newline - start));
+                start = newline + 1;
             }
+            FlushPendingData();
 
-            await Task.Delay(250, cts.Token); // 4Hz
-        }
-        catch (OperationCanceledException)
-        {
-            break;
-        }
-        catch (Exception ex)
-        {
-            Log($"Notify loop error: {ex.Message}", "error");
-        }
-    }
-});
-
-// Read stdin for commands
-var stdinTask = Task.Run(async () =>
-{
-    try
-    {
-        string? line;
-        while ((line = Console.ReadLine()) != null && !cts.Token.IsCancellationRequested)
-        {
-            if (string.IsNullOrWhiteSpace(line)) continue;
-            await HandleCommand(line);
+            // Keep the partial line at the front of the buffer for the next read
+            if (start > 0)
+            {
+                Buffer.BlockCopy(buffer, start, buffer, 0, filled - start);
+                filled -= start;
+            }
         }
     }
     catch (Exception ex)
@@ -453,6 +519,19 @@ var stdinTask = Task.Run(async () =>
     }
 });
 
+async Task HandleLine(ReadOnlyMemory<byte> line)
+{
+    if (line.Span.Trim(" \t\r"u8).IsEmpty) return;
+    await HandleCommand(line);
+}
+
+void FlushPendingData()
+{
+    if (pendingData == null) return;
+    server.UpdateData(pendingData);
+    pendingData = null;
+}
+
 // Wait for either stdin to close or cancellation
 try
 {
@@ -470,12 +549,12 @@ server.Stop();
 
 try
 {
-    await Task.WhenAll(notifyTask, stdinTask);
+    await stdinTask;
 }
 catch
 {
     // Ignore cancellation exceptions
 }
 
-SendEvent(new { type = "log", level = "info", message = "Shutting down..." });
+Log("Shutting down...");
 return 0;
@@ -51,6 +51,11 @@ class WindowsBroadcaster extends EventEmitter {
   private maxRestartAttempts = 3;
   private connectedDevice: DiscoveredDevice | null = null;
   private isScanning = false;
+  private stdoutRemainder = ''; // Partial line carried over between stdout chunks
+
+  // Latest fitness data waiting to be written; bursts within one event-loop turn collapse to one write
+  private pendingData: FtmsOutput | null = null;
+  private pendingDataFlush: NodeJS.Immediate | null = null;
 
   // Broadcast state tracking to prevent race conditions
   private isBroadcasting = false;
@@ -127,10 +132,13 @@ class WindowsBroadcaster extends EventEmitter {
   }
 
   private handleOutput(output: string): void {
-    const lines = output.trim().split('\n');
+    // Chunks don't follow line boundaries — hold back the trailing partial line
+    const lines = (this.stdoutRemainder + output).split('\n');
+    this.stdoutRemainder = lines.pop() ?? '';
 
     for (const line of lines) {
-      if (!line.trim()) continue;
+      // JSON.parse already skips surrounding whitespace (incl. the CR of CRLF)
+      if (line.length === 0 || line === '\r') continue;
 
       try {
         const message = JSON.parse(line);
@@ -246,11 +254,19 @@ class WindowsBroadcaster extends EventEmitter {
 
   private handleProcessExit(): void {
     this.process = null;
+    this.stdoutRemainder = '';
     this.isScanning = false;
     this.connectedDevice = null;
     this.isBroadcasting = false;
     this.broadcastStopTime = 0;
 
+    // Drop any data write queued for the dead process
+    if (this.pendingDataFlush) {
+      clearImmediate(this.pendingDataFlush);
+      this.pendingDataFlush = null;
+    }
+    this.pendingData = null;
+
     // Cancel any pending broadcast start
     if (this.pendingBroadcastStart) {
       clearTimeout(this.pendingBroadcastStart);
@@ -392,6 +408,22 @@ class WindowsBroadcaster extends EventEmitter {
       return;
     }
 
+    // Only the newest values matter to the 4Hz notifier — keep the last one and write once
+    this.pendingData = data;
+    if (!this.pendingDataFlush) {
+      this.pendingDataFlush = setImmediate(() => this.flushPendingData());
+    }
+  }
+
+  private flushPendingData(): void {
+    this.pendingDataFlush = null;
+    const data = this.pendingData;
+    this.pendingData = null;
+
+    if (!data || !this.process || !this.process.stdin) {
+      return;
+    }
+
     try {
       // Send in legacy format (no type field)
       const jsonLine = JSON.stringify(data) + '\n';
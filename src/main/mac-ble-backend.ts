@@ -18,19 +18,23 @@
  */
 
 import { EventEmitter } from 'events';
-import { BroadcasterStatus, FitnessData } from './bluetooth-broadcaster';
+import { BroadcasterStatus } from './bluetooth-broadcaster';
 import { FtmsOutput } from '../shared/types/fitness-data';
 
 // ─── FTMS packet builder ──────────────────────────────────────────────────────
 
-function buildIndoorBikeData(power: number, cadence: number, heartRate: number): Buffer {
-  // Flags: bit 2 = cadence present, bit 6 = power present, bit 9 = HR present
-  let flags = (1 << 2) | (1 << 6);
+// Indoor Bike Data flags: bit 2 = cadence present, bit 6 = power present, bit 9 = HR present
+const BIKE_DATA_FLAGS = (1 << 2) | (1 << 6);
+const BIKE_DATA_FLAGS_HR = BIKE_DATA_FLAGS | (1 << 9);
+
+/**
+ * Write an Indoor Bike Data frame into a caller-owned buffer.
+ * `buf` must be 9 bytes when heartRate > 0 (HR appended), 8 bytes otherwise.
+ */
+function writeIndoorBikeData(buf: Buffer, power: number, cadence: number, heartRate: number): Buffer {
   const hasHr = heartRate > 0;
-  if (hasHr) flags |= (1 << 9);
 
-  const buf = Buffer.alloc(hasHr ? 9 : 8);
-  buf.writeUInt16LE(flags, 0);
+  buf.writeUInt16LE(hasHr ? BIKE_DATA_FLAGS_HR : BIKE_DATA_FLAGS, 0);
   buf.writeUInt16LE(0, 2);                               // instantaneous speed = 0
   buf.writeUInt16LE(Math.max(0, Math.round(cadence * 2)), 4); // 0.5 rpm resolution
   buf.writeInt16LE(Math.max(0, power), 6);               // watts (signed)
@@ -63,6 +67,24 @@ function buildResistanceRange(): Buffer {
   return buf;
 }
 
+// Static read values — packed once at load and shared by every GATT read
+const FEATURE_VALUE = buildFeature();
+const POWER_RANGE_VALUE = buildPowerRange();
+const RESISTANCE_RANGE_VALUE = buildResistanceRange();
+
+// FTMS Control Point op codes we acknowledge (same set as FtmsGattServer.cs)
+const CONTROL_POINT_OPS: Record<number, string> = {
+  0x00: 'Request Control',
+  0x01: 'Reset',
+  0x04: 'Set Target Resistance',
+  0x05: 'Set Target Power',
+  0x07: 'Start/Resume',
+  0x08: 'Stop/Pause',
+};
+const CP_RESPONSE_CODE = 0x80;
+const CP_RESULT_SUCCESS = 0x01;
+const CP_RESULT_NOT_SUPPORTED = 0x02;
+
 // ─── Characteristic factories ─────────────────────────────────────────────────
 
 function makeReadChar(bleno: any, uuid: string, value: Buffer): any {
@@ -83,10 +105,10 @@ function makeControlPointChar(bleno: any, onLog: (m: string) => void): any {
   char.onWriteRequest = (data: Buffer, _offset: number, _withoutResponse: boolean, callback: (r: number) => void) => {
     if (data.length === 0) { callback(bleno.Characteristic.RESULT_SUCCESS); return; }
     const opCode = data[0];
-    onLog(`[MacBLE] Control point op: 0x${opCode.toString(16)}`);
-    // Respond with success for all known op codes
-    const response = Buffer.from([0x80, opCode, 0x01]);
-    char.notify(response);
+    const opName = CONTROL_POINT_OPS[opCode];
+    onLog(`[MacBLE] Control point op: 0x${opCode.toString(16)} (${opName ?? 'not supported'})`);
+    const result = opName ? CP_RESULT_SUCCESS : CP_RESULT_NOT_SUPPORTED;
+    char.notify(Buffer.from([CP_RESPONSE_CODE, opCode, result]));
     callback(bleno.Characteristic.RESULT_SUCCESS);
   };
   return char;
@@ -98,12 +120,20 @@ export class MacBleBackend extends EventEmitter {
   private bleno: any = null;
   private status: BroadcasterStatus = { state: 'stopped' };
   private isBroadcasting = false;
-  private currentData = { power: 0, cadence: 0, heartRate: 0 };
+  // Updated field by field in sendData() so the object keeps one shape and is never reallocated
+  private readonly currentData = { power: 0, cadence: 0, heartRate: 0 };
   private notifyInterval: NodeJS.Timeout | null = null;
   private bikeDataChar: any = null;
   private hrChar: any = null;
   private started = false;
 
+  // Notification frames are rebuilt in place only after sendData() changes the data
+  private bikeDataFrame = Buffer.alloc(8);
+  private bikeDataFrameHr = Buffer.alloc(9);
+  private hrFrame = Buffer.from([0x00, 0x00]); // flags 0x00 = HR is uint8
+  private currentBikeDataFrame = this.bikeDataFrame;
+  private framesDirty = true;
+
   constructor() {
     super();
     try {
@@ -150,10 +180,10 @@ export class MacBleBackend extends EventEmitter {
       const ftmsService = new this.bleno.PrimaryService({
         uuid: '1826',
         characteristics: [
-          makeReadChar(this.bleno, '2acc', buildFeature()),
+          makeReadChar(this.bleno, '2acc', FEATURE_VALUE),
           this.bikeDataChar,
-          makeReadChar(this.bleno, '2ad8', buildPowerRange()),
-          makeReadChar(this.bleno, '2ad6', buildResistanceRange()),
+          makeReadChar(this.bleno, '2ad8', POWER_RANGE_VALUE),
+          makeReadChar(this.bleno, '2ad6', RESISTANCE_RANGE_VALUE),
           makeControlPointChar(this.bleno, (m) => this.emit('log', m)),
           statusChar,
         ],
@@ -212,13 +242,26 @@ export class MacBleBackend extends EventEmitter {
     if (this.bleno.state === 'poweredOn') doAdvertise();
   }
 
-  private sendNotifications(): void {
+  private rebuildFrames(): void {
     const { power, cadence, heartRate } = this.currentData;
+    const frame = heartRate > 0 ? this.bikeDataFrameHr : this.bikeDataFrame;
+    this.currentBikeDataFrame = writeIndoorBikeData(frame, power, cadence, heartRate);
+    this.hrFrame[1] = Math.min(255, heartRate);
+    this.framesDirty = false;
+  }
+
+  private sendNotifications(): void {
+    if (this.framesDirty) this.rebuildFrames();
 
-    this.bikeDataChar?.notify(buildIndoorBikeData(power, cadence, heartRate));
+    const bikeDataChar = this.bikeDataChar;
+    const hrChar = this.hrChar;
 
-    if (heartRate > 0) {
-      this.hrChar?.notify(Buffer.from([0x00, Math.min(255, heartRate)]));
+    if (bikeDataChar) {
+      bikeDataChar.notify(this.currentBikeDataFrame);
+    }
+
+    if (hrChar && this.currentData.heartRate > 0) {
+      hrChar.notify(this.hrFrame);
     }
   }
 
@@ -238,11 +281,16 @@ export class MacBleBackend extends EventEmitter {
   }
 
   sendData(data: FtmsOutput): void {
-    this.currentData = {
-      power: data.power ?? 0,
-      cadence: data.cadence ?? 0,
-      heartRate: data.heartRate ?? 0,
-    };
+    const state = this.currentData;
+    const power = data.power ?? 0;
+    const cadence = data.cadence ?? 0;
+    const heartRate = data.heartRate ?? 0;
+    if (state.power === power && state.cadence === cadence && state.heartRate === heartRate) return;
+
+    state.power = power;
+    state.cadence = cadence;
+    state.heartRate = heartRate;
+    this.framesDirty = true;
   }
 
   disconnect(): void {